@@ -1,6 +1,6 @@
 {
     'name': 'Peruanita HR Employee Extensions',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.1.0',
     'category': 'Human Resources',
     'summary': 'Gestión de salidas, distribuciones y permisos de empleados',
     'description': """
@@ -13,13 +13,20 @@
     """,
     'author': 'Juan Salvador',
     'website': 'https://juansalvador.dev',
-    'depends': ['hr', 'base'],
+    'depends': ['hr', 'hr_contract', 'base'],
+    'external_dependencies': {
+        'python': ['numpy'],
+    },
     'data': [
         'security/ir.model.access.csv',
+        'security/ir_rules.xml',
+        'data/hr_employee_snapshot_actions.xml',
         'views/hr_employee_exit_views.xml',
         'views/hr_employee_distribution_views.xml',
         'views/hr_employee_permission_views.xml',
         'views/hr_employee_vacation_control_views.xml',
+        'views/hr_employee_vacation_forecast_views.xml',
+        'views/hr_employee_vacation_provision_views.xml',
         'views/hr_employee_views.xml',
         'views/menu_views.xml',
     ],
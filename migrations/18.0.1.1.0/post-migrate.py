@@ -0,0 +1,43 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Crear una asignación por línea existente contra su período original"""
+    if not version:
+        return
+    cr.execute("SELECT to_regclass('hr_employee_vacation_taken_legacy_control')")
+    if not cr.fetchone()[0]:
+        return
+    cr.execute("""
+        INSERT INTO hr_employee_vacation_allocation (
+            vacation_taken_id, vacation_control_id, employee_id, company_id, days,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT legacy.vacation_taken_id, legacy.vacation_control_id, legacy.employee_id, employee.company_id, legacy.days_taken,
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM hr_employee_vacation_taken_legacy_control legacy
+          JOIN hr_employee employee ON employee.id = legacy.employee_id
+         WHERE NOT EXISTS (
+                SELECT 1 FROM hr_employee_vacation_allocation allocation
+                 WHERE allocation.vacation_taken_id = legacy.vacation_taken_id
+               )
+    """, {'uid': SUPERUSER_ID})
+    cr.execute("DROP TABLE hr_employee_vacation_taken_legacy_control")
+
+    # Los cierres anteriores copiaban los días pendientes al período siguiente sin descontarlos
+    cr.execute("""
+        UPDATE hr_employee_vacation_control
+           SET days_transferred = days_pending
+         WHERE period_status = 'closed'
+           AND days_pending > 0
+    """)
+
+    # Recalcular los saldos desde las asignaciones (las líneas canceladas ya no descuentan días)
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Control = env['hr.employee.vacation.control']
+    controls = Control.search([])
+    for field_name in ('days_taken', 'days_total_available', 'days_pending'):
+        env.add_to_compute(Control._fields[field_name], controls)
+    Taken = env['hr.employee.vacation.taken']
+    env.add_to_compute(Taken._fields['vacation_control_id'], Taken.search([]))
+    env.flush_all()
@@ -0,0 +1,12 @@
+def migrate(cr, version):
+    """Guardar el período de cada línea existente antes de que vacation_control_id pase a ser calculado"""
+    if not version:
+        return
+    cr.execute("""
+        CREATE TABLE IF NOT EXISTS hr_employee_vacation_taken_legacy_control AS
+        SELECT id AS vacation_taken_id, vacation_control_id, employee_id, days_taken
+          FROM hr_employee_vacation_taken
+         WHERE vacation_control_id IS NOT NULL
+           AND status != 'cancelled'
+           AND days_taken > 0
+    """)
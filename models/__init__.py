@@ -1,5 +1,9 @@
+from . import hr_employee_snapshot_mixin
 from . import hr_employee_exit
 from . import hr_employee_distribution  
 from . import hr_employee_permission
 from . import hr_employee_vacation_control
-from . import hr_employee
\ No newline at end of file
+from . import hr_employee
+from . import hr_department
+from . import hr_employee_vacation_forecast
+from . import hr_employee_vacation_provision
\ No newline at end of file
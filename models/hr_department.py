@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from odoo import fields, models, _
+from odoo.exceptions import ValidationError
+
+
+# Códigos de la matriz de disponibilidad
+AVAILABLE = 0
+PARTIAL = 1
+PERMISSION = 2
+VACATION = 3
+
+
+class HrDepartment(models.Model):
+    _inherit = 'hr.department'
+
+    def get_availability_matrix(self, date_from, date_to, include_planned=True):
+        """Matriz empleado x día con la disponibilidad del departamento.
+
+        Se hace una sola consulta por modelo de origen (vacaciones y permisos) y
+        cada intervalo se pinta sobre un arreglo por empleado, sin búsquedas por día.
+        Códigos: 0 disponible, 1 permiso por horas, 2 permiso, 3 vacaciones.
+        """
+        self.ensure_one()
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if date_from > date_to:
+            raise ValidationError(_("La fecha de inicio debe ser anterior a la fecha de fin"))
+        days_count = (date_to - date_from).days + 1
+
+        employees = self.env['hr.employee'].search_read(
+            [('department_id', '=', self.id)], ['name'], order='name')
+        employee_ids = [employee['id'] for employee in employees]
+        intervals = []
+
+        statuses = ['approved', 'taken'] + (['planned'] if include_planned else [])
+        vacations = self.env['hr.employee.vacation.taken'].search_read([
+            ('employee_id', 'in', employee_ids),
+            ('status', 'in', statuses),
+            ('date_from', '<=', date_to),
+            ('date_to', '>=', date_from)
+        ], ['employee_id', 'date_from', 'date_to'])
+        for vacation in vacations:
+            intervals.append((VACATION, vacation['employee_id'][0], vacation['date_from'], vacation['date_to']))
+
+        # Permisos por su rango efectivo (ver hr.employee.permission._compute_effective_dates)
+        permissions = self.env['hr.employee.permission'].search_read([
+            ('employee_id', 'in', employee_ids),
+            ('date_start', '<=', date_to),
+            ('date_end', '>=', date_from)
+        ], ['employee_id', 'date_start', 'date_end', 'date_from', 'date_to', 'hours_quantity'])
+        for permission in permissions:
+            employee_id = permission['employee_id'][0]
+            if permission['hours_quantity'] and not permission['date_from'] and not permission['date_to']:
+                intervals.append((PARTIAL, employee_id, permission['date_start'], permission['date_start']))
+            else:
+                intervals.append((PERMISSION, employee_id, permission['date_start'], permission['date_end']))
+
+        # Pintar de menor a mayor prioridad: las vacaciones prevalecen sobre los permisos
+        rows = {employee_id: bytearray(days_count) for employee_id in employee_ids}
+        for code, employee_id, start, end in sorted(intervals, key=lambda interval: interval[0]):
+            start_index = max((start - date_from).days, 0)
+            end_index = min((end - date_from).days, days_count - 1)
+            if start_index <= end_index:
+                rows[employee_id][start_index:end_index + 1] = bytes([code]) * (end_index - start_index + 1)
+
+        return {
+            'dates': [fields.Date.to_string(date_from + timedelta(days=index)) for index in range(days_count)],
+            'employees': [{'id': employee['id'], 'name': employee['name']} for employee in employees],
+            'matrix': [list(rows[employee_id]) for employee_id in employee_ids],
+            'legend': {
+                AVAILABLE: _('Disponible'),
+                PARTIAL: _('Permiso por horas'),
+                PERMISSION: _('Permiso'),
+                VACATION: _('Vacaciones'),
+            },
+        }
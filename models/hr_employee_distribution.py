@@ -1,8 +1,9 @@
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 
 
 class HrEmployeeDistribution(models.Model):
     _name = 'hr.employee.distribution'
+    _inherit = ['hr.employee.snapshot.mixin']
     _description = 'Salidas por Distribución'
     _order = 'date desc, id desc'
     _rec_name = 'display_name'
@@ -25,20 +26,6 @@ class HrEmployeeDistribution(models.Model):
         ondelete='cascade'
     )
     
-    job_id = fields.Many2one(
-        'hr.job',
-        string='Puesto de Trabajo',
-        related='employee_id.job_id',
-        store=True
-    )
-    
-    department_id = fields.Many2one(
-        'hr.department',
-        string='Departamento',
-        related='employee_id.department_id',
-        store=True
-    )
-    
     date = fields.Date(
         string='Fecha',
         required=True,
@@ -79,6 +66,9 @@ class HrEmployeeDistribution(models.Model):
         string='Observaciones'
     )
 
+    def init(self):
+        tools.create_index(self._cr, 'hr_employee_distribution_company_date_index', self._table, ['company_id', 'date'])
+
     def name_get(self):
         result = []
         for record in self:
@@ -1,8 +1,9 @@
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 
 
 class HrEmployeeExit(models.Model):
     _name = 'hr.employee.exit'
+    _inherit = ['hr.employee.snapshot.mixin']
     _description = 'Salidas de Empleados'
     _order = 'date desc, id desc'
     _rec_name = 'display_name'
@@ -24,20 +25,6 @@ class HrEmployeeExit(models.Model):
         ondelete='cascade'
     )
     
-    job_id = fields.Many2one(
-        'hr.job',
-        string='Puesto de Trabajo',
-        related='employee_id.job_id',
-        store=True
-    )
-    
-    department_id = fields.Many2one(
-        'hr.department',
-        string='Departamento',
-        related='employee_id.department_id',
-        store=True
-    )
-    
     date = fields.Date(
         string='Fecha',
         required=True,
@@ -68,6 +55,10 @@ class HrEmployeeExit(models.Model):
         string='Observaciones'
     )
 
+    def init(self):
+        # Las listas y reportes de salidas filtran por compañía y ordenan por fecha
+        tools.create_index(self._cr, 'hr_employee_exit_company_date_index', self._table, ['company_id', 'date'])
+
     def name_get(self):
         result = []
         for record in self:
@@ -1,9 +1,11 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
+from datetime import timedelta
 
 
 class HrEmployeePermission(models.Model):
     _name = 'hr.employee.permission'
+    _inherit = ['hr.employee.snapshot.mixin']
     _description = 'Salidas por Permiso'
     _order = 'date desc, id desc'
     _rec_name = 'display_name'
@@ -23,26 +25,14 @@ class HrEmployeePermission(models.Model):
         'hr.employee',
         string='Empleado',
         required=True,
+        index=True,
         ondelete='cascade'
     )
     
-    job_id = fields.Many2one(
-        'hr.job',
-        string='Puesto de Trabajo',
-        related='employee_id.job_id',
-        store=True
-    )
-    
-    department_id = fields.Many2one(
-        'hr.department',
-        string='Departamento',
-        related='employee_id.department_id',
-        store=True
-    )
-    
     date = fields.Date(
         string='Fecha',
         required=True,
+        index=True,
         default=fields.Date.context_today
     )
     
@@ -53,11 +43,28 @@ class HrEmployeePermission(models.Model):
     )
     
     date_from = fields.Date(
-        string='Desde el Día'
+        string='Desde el Día',
+        index=True
     )
     
     date_to = fields.Date(
-        string='Hasta el Día'
+        string='Hasta el Día',
+        index=True
+    )
+
+    # Rango efectivo del permiso, para buscarlo con una sola condición de solapamiento
+    date_start = fields.Date(
+        string='Inicio Efectivo',
+        compute='_compute_effective_dates',
+        store=True,
+        help="'Desde el Día' o, si no se indicó, la fecha de registro"
+    )
+
+    date_end = fields.Date(
+        string='Fin Efectivo',
+        compute='_compute_effective_dates',
+        store=True,
+        help="'Hasta el Día' o, si no se indicó, el inicio más la cantidad de días"
     )
     
     # Horas
@@ -103,6 +110,21 @@ class HrEmployeePermission(models.Model):
         string='Observaciones'
     )
 
+    def init(self):
+        tools.create_index(self._cr, 'hr_employee_permission_company_date_index', self._table, ['company_id', 'date'])
+        tools.create_index(self._cr, 'hr_employee_permission_employee_range_index', self._table, ['employee_id', 'date_start', 'date_end'])
+
+    @api.depends('date', 'date_from', 'date_to', 'days_quantity')
+    def _compute_effective_dates(self):
+        for record in self:
+            record.date_start = record.date_from or record.date
+            if record.date_to:
+                record.date_end = record.date_to
+            elif record.date_start:
+                record.date_end = record.date_start + timedelta(days=max(record.days_quantity, 1) - 1)
+            else:
+                record.date_end = False
+
     @api.constrains('date_from', 'date_to')
     def _check_dates(self):
         for record in self:
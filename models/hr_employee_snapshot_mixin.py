@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+from odoo import api, fields, models
+
+
+class HrEmployeeSnapshotMixin(models.AbstractModel):
+    _name = 'hr.employee.snapshot.mixin'
+    _description = 'Compañía, Puesto y Departamento del Empleado al Registrar'
+
+    # Se capturan al registrar o al cambiar el empleado del registro; un cambio
+    # de compañía o departamento del empleado no reescribe su historial
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        compute='_compute_employee_snapshot',
+        store=True,
+        readonly=False,
+        precompute=True
+    )
+
+    job_id = fields.Many2one(
+        'hr.job',
+        string='Puesto de Trabajo',
+        compute='_compute_employee_snapshot',
+        store=True,
+        readonly=False,
+        precompute=True
+    )
+
+    department_id = fields.Many2one(
+        'hr.department',
+        string='Departamento',
+        compute='_compute_employee_snapshot',
+        store=True,
+        readonly=False,
+        precompute=True
+    )
+
+    @api.depends('employee_id')
+    def _compute_employee_snapshot(self):
+        for record in self:
+            record.company_id = record.employee_id.company_id
+            record.job_id = record.employee_id.job_id
+            record.department_id = record.employee_id.department_id
+
+    def action_sync_employee_snapshot(self):
+        """Resincronizar compañía, puesto y departamento con los actuales del empleado (corrección masiva)"""
+        groups = defaultdict(lambda: self.browse())
+        for record in self:
+            employee = record.employee_id
+            current = (employee.company_id, employee.job_id, employee.department_id)
+            if (record.company_id, record.job_id, record.department_id) != current:
+                groups[tuple(value.id for value in current)] |= record
+        # Una escritura por combinación de compañía, puesto y departamento
+        for (company_id, job_id, department_id), records in groups.items():
+            records.write({'company_id': company_id, 'job_id': job_id, 'department_id': department_id})
+        return True
@@ -1,11 +1,15 @@
-from odoo import api, fields, models, _
+from collections import defaultdict
+
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
+from odoo.tools import float_compare, float_is_zero
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
 
 class HrEmployeeVacationControl(models.Model):
     _name = 'hr.employee.vacation.control'
+    _inherit = ['hr.employee.snapshot.mixin']
     _description = 'Control de Vacaciones por Empleado'
     _order = 'period_year desc, employee_id'
     _rec_name = 'display_name'
@@ -24,23 +28,10 @@ class HrEmployeeVacationControl(models.Model):
         'hr.employee',
         string='Empleado',
         required=True,
+        index=True,
         ondelete='cascade'
     )
     
-    job_id = fields.Many2one(
-        'hr.job',
-        string='Puesto de Trabajo',
-        related='employee_id.job_id',
-        store=True
-    )
-    
-    department_id = fields.Many2one(
-        'hr.department',
-        string='Departamento',
-        related='employee_id.department_id',
-        store=True
-    )
-    
     period_year = fields.Integer(
         string='Año del Período',
         required=True,
@@ -90,6 +81,13 @@ class HrEmployeeVacationControl(models.Model):
         store=True,
         help='Días pendientes por tomar'
     )
+
+    days_transferred = fields.Float(
+        string='Días Transferidos',
+        default=0.0,
+        readonly=True,
+        help='Días pendientes trasladados al período siguiente al cerrar este período'
+    )
     
     # Estado del período
     period_status = fields.Selection([
@@ -127,16 +125,27 @@ class HrEmployeeVacationControl(models.Model):
         string='Vacaciones Tomadas'
     )
 
-    @api.depends('days_earned_current_period', 'days_from_previous_periods', 'days_taken')
+    # Días consumidos de este período (FIFO)
+    allocation_ids = fields.One2many(
+        'hr.employee.vacation.allocation',
+        'vacation_control_id',
+        string='Días Consumidos'
+    )
+
+    def init(self):
+        # Períodos de una compañía recorridos por fecha de inicio (reportes y cierres)
+        tools.create_index(self._cr, 'hr_employee_vacation_control_company_period_start_date_index', self._table, ['company_id', 'period_start_date'])
+
+    @api.depends('days_earned_current_period', 'days_from_previous_periods', 'days_taken', 'days_transferred')
     def _compute_days_totals(self):
         for record in self:
             record.days_total_available = record.days_earned_current_period + record.days_from_previous_periods
-            record.days_pending = record.days_total_available - record.days_taken
+            record.days_pending = record.days_total_available - record.days_taken - record.days_transferred
 
-    @api.depends('vacation_taken_ids.days_taken')
+    @api.depends('allocation_ids.days')
     def _compute_days_taken(self):
         for record in self:
-            record.days_taken = sum(record.vacation_taken_ids.mapped('days_taken'))
+            record.days_taken = sum(record.allocation_ids.mapped('days'))
 
     @api.constrains('period_start_date', 'period_end_date')
     def _check_period_dates(self):
@@ -169,6 +178,14 @@ class HrEmployeeVacationControl(models.Model):
         elif not self.is_vacation_granted:
             self.vacation_granted_date = False
 
+    def unlink(self):
+        # Las líneas que consumían de estos períodos vuelven a distribuirse en los restantes
+        lines = self.allocation_ids.vacation_taken_id
+        self.allocation_ids.sudo().unlink()
+        res = super().unlink()
+        lines.exists()._allocate_vacation_days()
+        return res
+
     def action_grant_vacation(self):
         """Acción para otorgar vacaciones"""
         self.ensure_one()
@@ -179,16 +196,25 @@ class HrEmployeeVacationControl(models.Model):
     def action_close_period(self):
         """Acción para cerrar el período vacacional"""
         self.ensure_one()
-        if self.days_pending > 0:
-            # Crear siguiente período con los días pendientes
-            next_period = self.env['hr.employee.vacation.control'].create({
-                'employee_id': self.employee_id.id,
-                'period_year': self.period_year + 1,
-                'period_start_date': self.period_end_date + relativedelta(days=1),
-                'period_end_date': self.period_end_date + relativedelta(years=1),
-                'days_from_previous_periods': self.days_pending,
-                'days_earned_current_period': 15.0,  # Días estándar
-            })
+        days_pending = self.days_pending
+        if days_pending > 0:
+            # Trasladar los días pendientes al siguiente período, dejándolos en cero aquí
+            next_period = self.search([
+                ('employee_id', '=', self.employee_id.id),
+                ('period_year', '=', self.period_year + 1)
+            ], limit=1)
+            if next_period:
+                next_period.days_from_previous_periods += days_pending
+            else:
+                next_period = self.env['hr.employee.vacation.control'].create({
+                    'employee_id': self.employee_id.id,
+                    'period_year': self.period_year + 1,
+                    'period_start_date': self.period_end_date + relativedelta(days=1),
+                    'period_end_date': self.period_end_date + relativedelta(years=1),
+                    'days_from_previous_periods': days_pending,
+                    'days_earned_current_period': 15.0,  # Días estándar
+                })
+            self.days_transferred += days_pending
         self.period_status = 'closed'
         return True
 
@@ -246,24 +272,43 @@ class HrEmployeeVacationTaken(models.Model):
         'hr.employee',
         string='Empleado',
         required=True,
+        index=True,
         ondelete='cascade'
     )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        compute='_compute_company_id',
+        store=True,
+        readonly=False,
+        precompute=True
+    )
     
     vacation_control_id = fields.Many2one(
         'hr.employee.vacation.control',
         string='Control de Vacaciones',
-        required=True,
-        ondelete='cascade'
+        compute='_compute_vacation_control_id',
+        store=True,
+        help='Período más antiguo del que se consumen los días de esta línea'
+    )
+
+    allocation_ids = fields.One2many(
+        'hr.employee.vacation.allocation',
+        'vacation_taken_id',
+        string='Distribución por Período'
     )
     
     date_from = fields.Date(
         string='Fecha de Inicio',
-        required=True
+        required=True,
+        index=True
     )
     
     date_to = fields.Date(
         string='Fecha de Fin',
-        required=True
+        required=True,
+        index=True
     )
     
     days_taken = fields.Float(
@@ -305,6 +350,15 @@ class HrEmployeeVacationTaken(models.Model):
         string='Observaciones'
     )
 
+    def init(self):
+        tools.create_index(self._cr, 'hr_employee_vacation_taken_company_date_from_index', self._table, ['company_id', 'date_from'])
+
+    @api.depends('employee_id')
+    def _compute_company_id(self):
+        # Se captura al registrar, como en hr.employee.snapshot.mixin
+        for record in self:
+            record.company_id = record.employee_id.company_id
+
     @api.depends('date_from', 'date_to')
     def _compute_days_taken(self):
         for record in self:
@@ -322,14 +376,79 @@ class HrEmployeeVacationTaken(models.Model):
                 if record.date_from > record.date_to:
                     raise ValidationError(_("La fecha de inicio de las vacaciones debe ser anterior a la fecha de fin"))
 
-    @api.constrains('vacation_control_id', 'days_taken')
-    def _check_available_days(self):
+    @api.depends('allocation_ids.vacation_control_id')
+    def _compute_vacation_control_id(self):
         for record in self:
-            if record.vacation_control_id and record.days_taken:
-                control = record.vacation_control_id
-                other_taken = sum(control.vacation_taken_ids.filtered(lambda x: x.id != record.id).mapped('days_taken'))
-                if (other_taken + record.days_taken) > control.days_total_available:
-                    raise ValidationError(_("No hay suficientes días de vacaciones disponibles. Disponibles: %s, Intentando tomar: %s") % (control.days_total_available - other_taken, record.days_taken))
+            controls = record.allocation_ids.vacation_control_id.sorted(lambda c: (c.period_year, c.period_start_date, c.id))
+            record.vacation_control_id = controls[:1]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._allocate_vacation_days()
+        return records
+
+    def write(self, vals):
+        # Solo las líneas que entran o salen de 'cancelled' liberan o vuelven a consumir días
+        cancel_toggled = self.browse()
+        if 'status' in vals:
+            cancel_toggled = self.filtered(lambda x: (x.status == 'cancelled') != (vals['status'] == 'cancelled'))
+        res = super().write(vals)
+        if any(field in vals for field in ('employee_id', 'date_from', 'date_to')):
+            self._allocate_vacation_days()
+        elif cancel_toggled:
+            cancel_toggled._allocate_vacation_days()
+        return res
+
+    def unlink(self):
+        # Liberar los días por el ORM para que se recalculen los saldos de los períodos
+        self.allocation_ids.sudo().unlink()
+        return super().unlink()
+
+    def _allocate_vacation_days(self):
+        """Consumir los días de las líneas desde los períodos abiertos del empleado,
+        empezando por el más antiguo (FIFO), en una sola pasada para todo el lote.
+
+        Lo consumido de períodos cerrados se conserva: ya forma parte de su cierre.
+        Las asignaciones solo se escriben desde aquí, como superusuario."""
+        open_allocations = self.allocation_ids.filtered(lambda x: x.vacation_control_id.period_status != 'closed')
+        closed_days = defaultdict(float)
+        for allocation in self.allocation_ids - open_allocations:
+            closed_days[allocation.vacation_taken_id.id] += allocation.days
+        open_allocations.sudo().unlink()
+        lines = self.filtered(lambda x: x.status != 'cancelled' and x.days_taken > 0)
+        if not lines:
+            return
+        controls = self.env['hr.employee.vacation.control'].search([
+            ('employee_id', 'in', lines.employee_id.ids),
+            ('period_status', '!=', 'closed')
+        ], order='period_year, period_start_date, id')
+        controls_by_employee = defaultdict(list)
+        remaining = {}
+        for control in controls:
+            controls_by_employee[control.employee_id.id].append(control)
+            remaining[control.id] = control.days_pending
+
+        allocation_vals = []
+        for record in lines.sorted(lambda x: (x.date_from, x.id)):
+            to_allocate = max(record.days_taken - closed_days[record.id], 0.0)
+            for control in controls_by_employee[record.employee_id.id]:
+                if float_is_zero(to_allocate, precision_digits=2):
+                    break
+                if float_compare(remaining[control.id], 0.0, precision_digits=2) <= 0:
+                    continue
+                days = min(remaining[control.id], to_allocate)
+                allocation_vals.append({
+                    'vacation_taken_id': record.id,
+                    'vacation_control_id': control.id,
+                    'days': days,
+                })
+                remaining[control.id] -= days
+                to_allocate -= days
+            if float_compare(to_allocate, 0.0, precision_digits=2) > 0:
+                raise ValidationError(_("No hay suficientes días de vacaciones disponibles para %s. Disponibles: %s, Intentando tomar: %s") % (
+                    record.employee_id.name, record.days_taken - to_allocate, record.days_taken))
+        self.env['hr.employee.vacation.allocation'].sudo().create(allocation_vals)
 
     def action_approve(self):
         """Aprobar las vacaciones"""
@@ -349,4 +468,61 @@ class HrEmployeeVacationTaken(models.Model):
         """Cancelar las vacaciones"""
         self.ensure_one()
         self.status = 'cancelled'
-        return True
\ No newline at end of file
+        return True
+
+
+class HrEmployeeVacationAllocation(models.Model):
+    _name = 'hr.employee.vacation.allocation'
+    _description = 'Días de Vacaciones Consumidos por Período'
+    _order = 'vacation_taken_id, id'
+
+    vacation_taken_id = fields.Many2one(
+        'hr.employee.vacation.taken',
+        string='Vacaciones Tomadas',
+        required=True,
+        index=True,
+        ondelete='cascade'
+    )
+
+    vacation_control_id = fields.Many2one(
+        'hr.employee.vacation.control',
+        string='Control de Vacaciones',
+        required=True,
+        index=True,
+        ondelete='cascade'
+    )
+
+    employee_id = fields.Many2one(
+        'hr.employee',
+        string='Empleado',
+        related='vacation_taken_id.employee_id',
+        store=True
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        related='vacation_taken_id.company_id',
+        store=True,
+        index=True
+    )
+
+    period_year = fields.Integer(
+        string='Año del Período',
+        related='vacation_control_id.period_year'
+    )
+
+    date_from = fields.Date(
+        string='Fecha de Inicio',
+        related='vacation_taken_id.date_from'
+    )
+
+    date_to = fields.Date(
+        string='Fecha de Fin',
+        related='vacation_taken_id.date_to'
+    )
+
+    days = fields.Float(
+        string='Días',
+        required=True
+    )
@@ -0,0 +1,203 @@
+import numpy as np
+
+from odoo import fields, models, tools
+from dateutil.relativedelta import relativedelta
+
+
+class HrEmployeeVacationForecast(models.Model):
+    _name = 'hr.employee.vacation.forecast'
+    _description = 'Proyección de Saldos de Vacaciones'
+    _order = 'forecast_month, employee_id'
+    _rec_name = 'employee_id'
+
+    FORECAST_MONTHS = 12
+
+    employee_id = fields.Many2one(
+        'hr.employee',
+        string='Empleado',
+        required=True,
+        ondelete='cascade'
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        readonly=True
+    )
+
+    department_id = fields.Many2one(
+        'hr.department',
+        string='Departamento',
+        readonly=True
+    )
+
+    forecast_month = fields.Date(
+        string='Mes',
+        required=True,
+        readonly=True,
+        help='Primer día del mes proyectado'
+    )
+
+    days_accrued = fields.Float(
+        string='Días Ganados',
+        readonly=True,
+        help='Días que se ganan en el mes por períodos aún no registrados'
+    )
+
+    days_planned = fields.Float(
+        string='Días Planificados',
+        readonly=True,
+        help='Días de vacaciones planificadas o aprobadas que inician en el mes'
+    )
+
+    days_expiring = fields.Float(
+        string='Días que Vencen',
+        readonly=True,
+        help='Días pendientes que vencen sin tomarse en el mes'
+    )
+
+    days_pending = fields.Float(
+        string='Días Pendientes al Cierre',
+        readonly=True,
+        help='Saldo proyectado de días pendientes al cierre del mes'
+    )
+
+    computed_date = fields.Datetime(
+        string='Calculado el',
+        readonly=True,
+        default=fields.Datetime.now
+    )
+
+    def init(self):
+        # La vista pivote lee la proyección de una compañía agrupada por mes
+        tools.create_index(self._cr, 'hr_employee_vacation_forecast_company_month_index', self._table, ['company_id', 'forecast_month'])
+
+    def action_compute_forecast(self):
+        """Proyectar los próximos doce meses del saldo de vacaciones de todos los empleados.
+
+        Los datos se cargan una sola vez y la proyección se calcula con arreglos
+        (empleados x meses), consumiendo los períodos por orden de vencimiento (FIFO).
+        Se llama desde el encabezado de la lista, por lo que ignora los registros seleccionados.
+        """
+        Forecast = self.env[self._name]
+        months = self.FORECAST_MONTHS
+        start = fields.Date.context_today(self).replace(day=1)
+        month_starts = [start + relativedelta(months=index) for index in range(months + 1)]
+        company_ids = self.env.companies.ids
+
+        employees = self.env['hr.employee'].search_read(
+            [('company_id', 'in', company_ids)], ['company_id', 'department_id'], order='id')
+        employee_index = {employee['id']: index for index, employee in enumerate(employees)}
+
+        def month_index(values):
+            """Índice del mes de cada fecha respecto al inicio de la proyección"""
+            return np.array([(value.year - start.year) * 12 + value.month - start.month for value in values], dtype=int)
+
+        # Períodos abiertos: cada uno es un "tramo" de días con su fecha de vencimiento
+        controls = self.env['hr.employee.vacation.control'].search_read([
+            ('employee_id', 'in', list(employee_index)),
+            ('period_status', '!=', 'closed')
+        ], ['employee_id', 'days_pending', 'days_earned_current_period', 'period_end_date', 'deadline_to_take_vacations'])
+
+        # Días ya asignados a vacaciones futuras: vuelven al saldo y se consumen en la proyección
+        future_domain = [
+            ('vacation_taken_id.status', 'in', ['planned', 'approved']),
+            ('vacation_taken_id.date_from', '>=', start),
+            ('vacation_taken_id.date_from', '<', month_starts[-1]),
+            ('employee_id', 'in', list(employee_index))
+        ]
+        reserved = {
+            control.id: days
+            for control, days in self.env['hr.employee.vacation.allocation']._read_group(
+                future_domain, ['vacation_control_id'], ['days:sum'])
+        }
+        planned_lines = self.env['hr.employee.vacation.taken'].search_read([
+            ('employee_id', 'in', list(employee_index)),
+            ('status', 'in', ['planned', 'approved']),
+            ('date_from', '>=', start),
+            ('date_from', '<', month_starts[-1])
+        ], ['employee_id', 'date_from', 'days_taken'])
+
+        employee_count = len(employees)
+        shape = (employee_count, months)
+
+        # Consumo planificado por empleado y mes
+        planned = np.zeros(shape)
+        if planned_lines:
+            np.add.at(
+                planned,
+                (np.array([employee_index[line['employee_id'][0]] for line in planned_lines]),
+                 month_index([line['date_from'] for line in planned_lines])),
+                np.array([line['days_taken'] for line in planned_lines]),
+            )
+        consumed = np.cumsum(planned, axis=1)
+
+        # Ganancia mensual a partir del fin del último período registrado
+        accrual_rate = np.full(employee_count, 15.0 / 12)
+        last_end = np.full(employee_count, -1)
+        balance = np.zeros(employee_count)
+        expiring = np.zeros(shape)
+        if controls:
+            control_employee = np.array([employee_index[control['employee_id'][0]] for control in controls])
+            control_balance = np.array([
+                control['days_pending'] + reserved.get(control['id'], 0.0) for control in controls
+            ])
+            deadlines = [
+                control['deadline_to_take_vacations'] or control['period_end_date'] + relativedelta(months=12)
+                for control in controls
+            ]
+            # Los ya vencidos con saldo se reportan como vencidos en el primer mes
+            control_deadline = np.clip(month_index(deadlines), 0, months)
+            control_end = month_index([control['period_end_date'] for control in controls])
+            np.add.at(balance, control_employee, control_balance)
+            np.maximum.at(last_end, control_employee, control_end)
+            # La tasa de ganancia es la del período más reciente de cada empleado
+            control_earned = np.array([control['days_earned_current_period'] for control in controls])
+            latest = np.lexsort((control_end, control_employee))
+            last_of_employee = np.r_[control_employee[latest][1:] != control_employee[latest][:-1], True]
+            accrual_rate[control_employee[latest][last_of_employee]] = control_earned[latest][last_of_employee] / 12
+
+            # Orden FIFO: por empleado y fecha de vencimiento
+            order = np.lexsort((control_deadline, control_employee))
+            control_employee = control_employee[order]
+            control_balance = np.maximum(control_balance[order], 0.0)
+            control_deadline = control_deadline[order]
+            expires = control_deadline < months
+
+            # Límite superior acumulado de cada tramo dentro de su empleado
+            cumulative = np.cumsum(control_balance)
+            first_of_employee = np.r_[True, control_employee[1:] != control_employee[:-1]]
+            segment_start = np.maximum.accumulate(np.where(first_of_employee, np.arange(len(order)), 0))
+            upper = cumulative - (cumulative - control_balance)[segment_start]
+
+            # Días vencidos acumulados = máximo acumulado de (límite - consumido al vencer)
+            consumed_at_deadline = consumed[control_employee, np.minimum(control_deadline, months - 1)]
+            gap = np.where(expires, np.maximum(upper - consumed_at_deadline, 0.0), 0.0)
+            offset = np.cumsum(first_of_employee) * (gap.max() + 1.0)
+            expired_total = np.maximum.accumulate(gap + offset) - offset
+            previous_total = np.where(first_of_employee, 0.0, np.r_[0.0, expired_total[:-1]])
+            expired_now = expired_total - previous_total
+            np.add.at(expiring, (control_employee[expires], control_deadline[expires]), expired_now[expires])
+
+        accrued = accrual_rate[:, None] * (np.arange(months)[None, :] > last_end[:, None])
+        pending = (balance[:, None] + np.cumsum(accrued, axis=1)
+                   - consumed - np.cumsum(expiring, axis=1))
+
+        Forecast.search([('company_id', 'in', company_ids)]).unlink()
+        now = fields.Datetime.now()
+        vals_list = []
+        for index, employee in enumerate(employees):
+            for month in range(months):
+                vals_list.append({
+                    'employee_id': employee['id'],
+                    'company_id': employee['company_id'] and employee['company_id'][0],
+                    'department_id': employee['department_id'] and employee['department_id'][0],
+                    'forecast_month': month_starts[month],
+                    'days_accrued': float(accrued[index, month]),
+                    'days_planned': float(planned[index, month]),
+                    'days_expiring': float(expiring[index, month]),
+                    'days_pending': float(pending[index, month]),
+                    'computed_date': now,
+                })
+        Forecast.create(vals_list)
+        return self.env['ir.actions.actions']._for_xml_id('peruanita_hr_employee.action_hr_employee_vacation_forecast')
@@ -0,0 +1,123 @@
+from odoo import fields, models, tools
+from dateutil.relativedelta import relativedelta
+
+
+class HrEmployeeVacationProvision(models.Model):
+    _name = 'hr.employee.vacation.provision'
+    _description = 'Provisión de Vacaciones Pendientes'
+    _order = 'snapshot_date desc, company_id, department_id'
+    _rec_name = 'snapshot_date'
+
+    # Días de sueldo por mes para obtener el jornal diario a partir del sueldo mensual
+    DAYS_PER_MONTH = 30.0
+
+    snapshot_date = fields.Date(
+        string='Fecha de la Foto',
+        required=True,
+        readonly=True,
+        help='Fecha en que se calcularon los saldos; se conserva una foto por mes'
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        readonly=True
+    )
+
+    department_id = fields.Many2one(
+        'hr.department',
+        string='Departamento',
+        readonly=True
+    )
+
+    currency_id = fields.Many2one(
+        'res.currency',
+        string='Moneda',
+        readonly=True
+    )
+
+    employee_count = fields.Integer(
+        string='Empleados',
+        readonly=True
+    )
+
+    days_pending = fields.Float(
+        string='Días Pendientes',
+        readonly=True
+    )
+
+    days_without_contract = fields.Float(
+        string='Días sin Contrato Vigente',
+        readonly=True,
+        help='Días pendientes de empleados sin contrato vigente al cierre, no valorizados'
+    )
+
+    amount = fields.Monetary(
+        string='Provisión',
+        currency_field='currency_id',
+        readonly=True,
+        help='Días pendientes por el jornal diario (sueldo del contrato / 30)'
+    )
+
+    def init(self):
+        # Reemplazo y comparación de fotos mensuales por compañía
+        tools.create_index(self._cr, 'hr_employee_vacation_provision_company_date_index', self._table, ['company_id', 'snapshot_date'])
+
+    def action_compute_provision(self):
+        """Registrar la provisión del cierre de mes con una sola consulta agregada.
+
+        Los saldos son los actuales, por lo que la foto se fecha con el día del cálculo;
+        para el cierre de mes debe ejecutarse el último día del mes. Cada nueva foto
+        reemplaza a la del mismo mes y compañías. Se llama desde el encabezado de la
+        lista, por lo que ignora los registros seleccionados.
+        """
+        Provision = self.env[self._name]
+        Provision.check_access('create')
+        snapshot_date = fields.Date.context_today(self)
+        company_ids = tuple(self.env.companies.ids)
+
+        self.env['hr.employee.vacation.control'].flush_model(['employee_id', 'days_pending', 'period_status'])
+        self.env['hr.employee'].flush_model(['company_id', 'department_id'])
+        self.env['hr.contract'].flush_model(['employee_id', 'wage', 'state', 'date_start', 'date_end'])
+
+        Provision.search([
+            ('snapshot_date', '>=', snapshot_date.replace(day=1)),
+            ('snapshot_date', '<=', snapshot_date + relativedelta(day=31)),
+            ('company_id', 'in', company_ids)
+        ]).unlink()
+        self.env.cr.execute("""
+            WITH contract AS (
+                SELECT DISTINCT ON (c.employee_id) c.employee_id, c.wage
+                  FROM hr_contract c
+                 WHERE c.state NOT IN ('draft', 'cancel')
+                   AND c.date_start <= %(snapshot_date)s
+                   AND (c.date_end IS NULL OR c.date_end >= %(snapshot_date)s)
+              ORDER BY c.employee_id, c.date_start DESC
+            )
+            INSERT INTO hr_employee_vacation_provision (
+                snapshot_date, company_id, department_id, currency_id,
+                employee_count, days_pending, days_without_contract, amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT %(snapshot_date)s, employee.company_id, employee.department_id, company.currency_id,
+                   COUNT(DISTINCT vc.employee_id),
+                   SUM(vc.days_pending),
+                   SUM(CASE WHEN contract.wage IS NULL THEN vc.days_pending ELSE 0 END),
+                   SUM(vc.days_pending * COALESCE(contract.wage, 0) / %(days_per_month)s),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM hr_employee_vacation_control vc
+              JOIN hr_employee employee ON employee.id = vc.employee_id
+              JOIN res_company company ON company.id = employee.company_id
+         LEFT JOIN contract ON contract.employee_id = vc.employee_id
+             WHERE vc.period_status != 'closed'
+               AND vc.days_pending > 0
+               AND employee.company_id IN %(company_ids)s
+          GROUP BY employee.company_id, employee.department_id, company.currency_id
+        """, {
+            'snapshot_date': snapshot_date,
+            'company_ids': company_ids,
+            'days_per_month': self.DAYS_PER_MONTH,
+            'uid': self.env.uid,
+        })
+        Provision.invalidate_model()
+        return self.env['ir.actions.actions']._for_xml_id('peruanita_hr_employee.action_hr_employee_vacation_provision')
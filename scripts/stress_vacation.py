@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Prueba de estrés de escrituras concurrentes sobre el control de vacaciones.
+
+Reproduce localmente varios usuarios de RRHH e importaciones creando períodos,
+registrando vacaciones y aprobándolas al mismo tiempo desde varios hilos, cada
+uno con su propio cursor. Al final reporta rendimiento, reintentos y las
+violaciones de invariantes encontradas en la base de datos.
+
+Uso:
+    python scripts/stress_vacation.py -c /etc/odoo.conf -d mi_base \\
+        --workers 8 --operations 200 --employees 5 --seed 42
+
+Los empleados de prueba se crean con el prefijo STRESS y se eliminan con --cleanup.
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import psycopg2.errors
+
+import odoo
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import ValidationError
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger('stress_vacation')
+
+EMPLOYEE_PREFIX = 'STRESS'
+RETRYABLE_ERRORS = (
+    psycopg2.errors.SerializationFailure,
+    psycopg2.errors.DeadlockDetected,
+    psycopg2.errors.LockNotAvailable,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--config', help='Archivo de configuración de Odoo')
+    parser.add_argument('-d', '--database', required=True, help='Base de datos con el módulo instalado')
+    parser.add_argument('--workers', type=int, default=8, help='Hilos concurrentes')
+    parser.add_argument('--operations', type=int, default=100, help='Operaciones por hilo')
+    parser.add_argument('--employees', type=int, default=5, help='Empleados de prueba compartidos entre hilos')
+    parser.add_argument('--years', type=int, default=3, help='Años distintos de período a disputar')
+    parser.add_argument('--max-retries', type=int, default=5, help='Reintentos por operación ante conflictos')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla para reproducir la misma secuencia')
+    parser.add_argument('--cleanup', action='store_true', help='Eliminar los datos de prueba y salir')
+    return parser.parse_args()
+
+
+def prepare_employees(registry, count):
+    """Crear (o reutilizar) los empleados de prueba y devolver sus ids"""
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        Employee = env['hr.employee']
+        employees = Employee.search([('name', '=like', f'{EMPLOYEE_PREFIX} %')], order='id')
+        missing = count - len(employees)
+        if missing > 0:
+            employees += Employee.create([
+                {'name': f'{EMPLOYEE_PREFIX} {len(employees) + index + 1:03d}'}
+                for index in range(missing)
+            ])
+        return employees[:count].ids
+
+
+def cleanup(registry):
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        employees = env['hr.employee'].with_context(active_test=False).search([
+            ('name', '=like', f'{EMPLOYEE_PREFIX} %')
+        ])
+        # Las líneas y períodos se eliminan en cascada con el empleado
+        employees.unlink()
+        _logger.info("Eliminados %s empleados de prueba", len(employees))
+
+
+class Worker(threading.Thread):
+    """Hilo que ejecuta una secuencia aleatoria (reproducible) de operaciones"""
+
+    def __init__(self, index, registry, employee_ids, args):
+        super().__init__(name=f'stress-{index}')
+        self.registry = registry
+        self.employee_ids = employee_ids
+        self.args = args
+        self.random = random.Random(args.seed * 1000 + index)
+        self.stats = Counter()
+
+    def run(self):
+        threading.current_thread().dbname = self.registry.db_name
+        operations = [self.create_period, self.create_vacation, self.approve_vacation]
+        for __ in range(self.args.operations):
+            operation = self.random.choice(operations)
+            self.execute(operation)
+
+    def execute(self, operation):
+        for attempt in range(self.args.max_retries + 1):
+            try:
+                with self.registry.cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    operation(env)
+                self.stats[f'{operation.__name__}_ok'] += 1
+                return
+            except RETRYABLE_ERRORS:
+                self.stats['retries'] += 1
+                time.sleep(self.random.uniform(0.0, 0.05) * (attempt + 1))
+            except ValidationError:
+                self.stats[f'{operation.__name__}_rejected'] += 1
+                return
+            except Exception:
+                _logger.exception("Error inesperado en %s", operation.__name__)
+                self.stats['errors'] += 1
+                return
+        self.stats['gave_up'] += 1
+
+    def pick_year(self):
+        return date.today().year - self.random.randrange(self.args.years)
+
+    def create_period(self, env):
+        year = self.pick_year()
+        employee_id = self.random.choice(self.employee_ids)
+        if env['hr.employee.vacation.control'].search_count([
+            ('employee_id', '=', employee_id),
+            ('period_year', '=', year)
+        ]):
+            return
+        env['hr.employee.vacation.control'].create({
+            'employee_id': employee_id,
+            'period_year': year,
+            'period_start_date': date(year, 1, 1),
+            'period_end_date': date(year, 12, 31),
+            'days_earned_current_period': 15.0,
+        })
+
+    def create_vacation(self, env):
+        employee_id = self.random.choice(self.employee_ids)
+        date_from = date.today() + timedelta(days=self.random.randrange(365))
+        env['hr.employee.vacation.taken'].create({
+            'employee_id': employee_id,
+            'date_from': date_from,
+            'date_to': date_from + timedelta(days=self.random.randrange(1, 10)),
+        })
+
+    def approve_vacation(self, env):
+        vacation = env['hr.employee.vacation.taken'].search([
+            ('employee_id', 'in', self.employee_ids),
+            ('status', '=', 'planned')
+        ], limit=1, order='id')
+        if vacation:
+            vacation.action_approve()
+
+
+def check_invariants(registry, employee_ids):
+    """Consultar directamente en SQL las invariantes que no deben romperse"""
+    checks = {
+        'días pendientes negativos': """
+            SELECT id FROM hr_employee_vacation_control
+             WHERE employee_id IN %s AND days_pending < 0
+        """,
+        'períodos duplicados (empleado, año)': """
+            SELECT employee_id, period_year FROM hr_employee_vacation_control
+             WHERE employee_id IN %s
+          GROUP BY employee_id, period_year HAVING COUNT(*) > 1
+        """,
+        'días tomados del período distintos a lo consumido': """
+            SELECT c.id FROM hr_employee_vacation_control c
+         LEFT JOIN hr_employee_vacation_allocation a ON a.vacation_control_id = c.id
+             WHERE c.employee_id IN %s
+          GROUP BY c.id, c.days_taken
+            HAVING ABS(COALESCE(SUM(a.days), 0) - COALESCE(c.days_taken, 0)) > 0.001
+        """,
+        'líneas con días sin consumir de ningún período': """
+            SELECT t.id FROM hr_employee_vacation_taken t
+         LEFT JOIN hr_employee_vacation_allocation a ON a.vacation_taken_id = t.id
+             WHERE t.employee_id IN %s AND t.status != 'cancelled'
+          GROUP BY t.id, t.days_taken
+            HAVING ABS(COALESCE(SUM(a.days), 0) - COALESCE(t.days_taken, 0)) > 0.001
+        """,
+    }
+    violations = {}
+    with registry.cursor() as cr:
+        for name, query in checks.items():
+            cr.execute(query, [tuple(employee_ids)])
+            violations[name] = cr.fetchall()
+    return violations
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(threadName)s %(levelname)s %(message)s')
+    config_args = ['-d', args.database] + (['-c', args.config] if args.config else [])
+    odoo.tools.config.parse_config(config_args)
+    # Un hilo por conexión, más la del proceso principal
+    odoo.tools.config['db_maxconn'] = max(odoo.tools.config['db_maxconn'], args.workers + 2)
+    registry = Registry(args.database)
+
+    if args.cleanup:
+        cleanup(registry)
+        return
+
+    employee_ids = prepare_employees(registry, args.employees)
+    workers = [Worker(index, registry, employee_ids, args) for index in range(args.workers)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    totals = sum((worker.stats for worker in workers), Counter())
+    completed = sum(value for key, value in totals.items() if key.endswith(('_ok', '_rejected')))
+    print(f"\nHilos: {args.workers}  Operaciones: {args.workers * args.operations}  Semilla: {args.seed}")
+    print(f"Tiempo: {elapsed:.2f}s  Rendimiento: {completed / elapsed:.1f} op/s")
+    for key in sorted(totals):
+        print(f"  {key}: {totals[key]}")
+
+    violations = check_invariants(registry, employee_ids)
+    print("\nInvariantes:")
+    for name, rows in violations.items():
+        status = 'OK' if not rows else f'{len(rows)} VIOLACIONES {rows[:10]}'
+        print(f"  {name}: {status}")
+    if any(violations.values()):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()